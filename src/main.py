@@ -1,46 +1,133 @@
+import atexit
+import csv
 import os
 import sys
 import traceback
 from datetime import datetime
-from collections import deque
+from collections import deque, namedtuple
 
 import tkinter as tk
-import matplotlib as mpl
-
-_ENV_BACKEND = os.environ.get("MPLBACKEND")
+from tkinter import filedialog, messagebox, simpledialog, ttk, Tk
+
+# 重量级科学计算库（matplotlib/numpy/scipy/PIL）在 init_heavy_imports 中延迟加载，
+# 让欢迎界面先于几百毫秒的导入时间出现
+mpl = None
+plt = None
+np = None
+PchipInterpolator = None
+Image = None
 _BACKEND_SOURCE = "auto"
-if _ENV_BACKEND:
-    mpl.use(_ENV_BACKEND, force=True)
-    _BACKEND_SOURCE = f"env:{_ENV_BACKEND}"
-else:
+
+
+def init_heavy_imports():
+    global mpl, plt, np, PchipInterpolator, Image, _BACKEND_SOURCE
+    if mpl is not None:
+        return
+    import matplotlib
+    mpl = matplotlib
+
+    env_backend = os.environ.get("MPLBACKEND")
+    if env_backend:
+        mpl.use(env_backend, force=True)
+        _BACKEND_SOURCE = f"env:{env_backend}"
+    else:
+        try:
+            mpl.use("QtAgg", force=True)
+            import matplotlib.backends.backend_qtagg  # noqa: F401
+            _BACKEND_SOURCE = "auto:QtAgg"
+        except Exception:
+            mpl.use("TkAgg", force=True)
+            _BACKEND_SOURCE = "auto:TkAgg"
+
+    # 避免中文显示为方块：尽量使用常见中文字体，不影响无该字体的环境
+    mpl.rcParams["font.sans-serif"] = ["Microsoft YaHei", "SimHei", "Arial Unicode MS", "sans-serif"]
+    mpl.rcParams["axes.unicode_minus"] = False
+
+    import numpy
+    import matplotlib.pyplot
+    from scipy.interpolate import PchipInterpolator as _PchipInterpolator
+    from PIL import Image as _Image
+
+    np = numpy
+    plt = matplotlib.pyplot
+    PchipInterpolator = _PchipInterpolator
+    Image = _Image
+    _init_numba()
+
+
+# Numba 可用时把逐点仿射与 PCHIP 求值编译成机器码（小数组上省掉 NumPy 逐调用开销），
+# 未安装则保持 numpy/scipy 路径
+_affine_nb = None
+_pchip_eval_nb = None
+
+
+def _init_numba():
+    global _affine_nb, _pchip_eval_nb
     try:
-        mpl.use("QtAgg", force=True)
-        import matplotlib.backends.backend_qtagg  # noqa: F401
-        _BACKEND_SOURCE = "auto:QtAgg"
+        from numba import njit
+    except ImportError:
+        return
+    try:
+        affine_nb = njit(cache=True)(_affine_transform)
+        pchip_nb = njit(cache=True)(_pchip_eval)
+        # njit 只是包装，真正的编译发生在首次调用；用最小输入在启动时触发，
+        # 编译失败在这里降级到 numpy/scipy，编译耗时也不落在用户第一次取点上
+        warm = np.array([0.0, 1.0])
+        affine_nb(warm, warm, warm, warm)
+        pchip_nb(warm, warm, warm)
     except Exception:
-        mpl.use("TkAgg", force=True)
-        _BACKEND_SOURCE = "auto:TkAgg"
+        return
+    _affine_nb = affine_nb
+    _pchip_eval_nb = pchip_nb
 
-# 避免中文显示为方块：尽量使用常见中文字体，不影响无该字体的环境
-mpl.rcParams["font.sans-serif"] = ["Microsoft YaHei", "SimHei", "Arial Unicode MS", "sans-serif"]
-mpl.rcParams["axes.unicode_minus"] = False
 
-import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
-from scipy.interpolate import PchipInterpolator
-from PIL import Image
-from tkinter import filedialog, messagebox, simpledialog, Tk
+CalibStep = namedtuple(
+    "CalibStep",
+    "stage step overlay prompt prompt_title default coord pix_key val_key",
+)
 
 DEFAULT_IGVS = [0, 20, 40, 60, 80]
 DEFAULT_NUM_POINTS = 10
 DEFAULT_DESIGN_FLOW = 5776
+FIGSIZE = (12, 8)
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 LOG_PATH = os.path.join(BASE_DIR, "run.log")
 CURRENT_STAGE = "init"
 OVERLAY_TEXT = None
+OVERLAY_BG = None
 CANCEL_REASON = None
 INTERACTION = None
+_LOG_FH = None
+_TK_ROOT = None
+
+
+def get_tk_root():
+    # 所有对话框复用同一个隐藏根窗口，Tcl 解释器与字体只初始化一次
+    global _TK_ROOT
+    if _TK_ROOT is None:
+        _TK_ROOT = Tk()
+        _TK_ROOT.withdraw()
+        _TK_ROOT.update()
+    return _TK_ROOT
+
+
+def destroy_tk_root():
+    global _TK_ROOT
+    if _TK_ROOT is not None:
+        try:
+            _TK_ROOT.destroy()
+        except Exception:
+            pass
+        _TK_ROOT = None
+
+
+def _log_fh():
+    # 首次调用时打开并保持句柄（行缓冲），避免每条日志 open/close 的系统调用开销
+    global _LOG_FH
+    if _LOG_FH is None:
+        _LOG_FH = open(LOG_PATH, "a", encoding="utf-8", buffering=1)
+        atexit.register(_LOG_FH.close)
+    return _LOG_FH
 
 
 def log(msg):
@@ -48,8 +135,7 @@ def log(msg):
     line = f"[{ts}] [{CURRENT_STAGE}] {msg}"
     print(line, flush=True)
     try:
-        with open(LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        _log_fh().write(line + "\n")
     except Exception:
         pass
 
@@ -77,6 +163,12 @@ class InteractionManager:
         self.ax = ax
         self.close_state = close_state
         self.queue = deque()
+        # 单点等待模式：回调直接写入单事件槽，省去 deque 往返
+        self._mode = "queue"
+        self._single_result = None
+        # 取点缓冲：连续的 (N, 2) 数组按倍增扩容，免去每条曲线的元组列表再转数组
+        self._pts_buf = np.empty((16, 2))
+        self._pts_n = 0
         self.cid_click = fig.canvas.mpl_connect("button_press_event", self._on_click)
         self.cid_key = fig.canvas.mpl_connect("key_press_event", self._on_key)
 
@@ -85,16 +177,26 @@ class InteractionManager:
             return
         if event.button != 1:
             return
-        self.queue.append(("click", (event.xdata, event.ydata)))
+        self._dispatch(("click", (event.xdata, event.ydata)))
 
     def _on_key(self, event):
         key = event.key
         if key in ("escape", "q"):
-            self.queue.append(("cancel", None))
+            evt = ("cancel", None)
         elif key in ("b", "backspace"):
-            self.queue.append(("back", None))
+            evt = ("back", None)
         elif key in ("enter", "return"):
-            self.queue.append(("finish", None))
+            evt = ("finish", None)
+        else:
+            return
+        self._dispatch(evt)
+
+    def _dispatch(self, evt):
+        if self._mode == "single":
+            self._single_result = evt
+        else:
+            self.queue.append(evt)
+        self.fig.canvas.stop_event_loop()
 
     def _ensure_alive(self):
         if self.close_state.get("closed"):
@@ -110,52 +212,71 @@ class InteractionManager:
         self._ensure_alive()
         if self.queue:
             return self.queue.popleft()
-        plt.pause(0.05)
+        # 阻塞等待回调 stop_event_loop 唤醒；timeout 仅用于周期性检测窗口是否被关闭
+        self.fig.canvas.start_event_loop(timeout=0.5)
         self._ensure_alive()
         if self.queue:
             return self.queue.popleft()
         return None
 
     def wait_single(self):
-        while True:
-            evt = self._poll()
-            if evt is None:
-                continue
-            kind, payload = evt
-            if kind == "click":
-                return "ok", payload
-            if kind == "back":
-                return "back", None
-            if kind == "cancel":
-                set_cancel_reason("用户中止")
-                log("用户通过键盘中止")
-                raise UserCancelled(CANCEL_REASON or "用户中止")
-            if kind == "finish":
-                # ignore finish for single point
-                continue
+        self._mode = "single"
+        self._single_result = None
+        try:
+            while True:
+                self._ensure_alive()
+                evt = self._single_result
+                if evt is None:
+                    self.fig.canvas.start_event_loop(timeout=0.5)
+                    continue
+                self._single_result = None
+                kind, payload = evt
+                if kind == "click":
+                    return "ok", payload
+                if kind == "back":
+                    return "back", None
+                if kind == "cancel":
+                    set_cancel_reason("用户中止")
+                    log("用户通过键盘中止")
+                    raise UserCancelled(CANCEL_REASON or "用户中止")
+                # finish 在单点模式下忽略
+        finally:
+            self._mode = "queue"
+
+    def _append_point(self, xy):
+        if self._pts_n == len(self._pts_buf):
+            grown = np.empty((len(self._pts_buf) * 2, 2))
+            grown[: self._pts_n] = self._pts_buf
+            self._pts_buf = grown
+        self._pts_buf[self._pts_n] = xy
+        self._pts_n += 1
+
+    def _pop_point(self):
+        self._pts_n -= 1
+        return tuple(self._pts_buf[self._pts_n])
 
     def wait_many(self, overlay_base, step_label, update_overlay):
-        points = []
+        self._pts_n = 0
         while True:
-            overlay_msg = f"{overlay_base}\n已取点: {len(points)} 个。左键添加点，B 撤销上一个，回车结束，Q/ESC 中止。"
+            overlay_msg = f"{overlay_base}\n已取点: {self._pts_n} 个。左键添加点，B 撤销上一个，回车结束，Q/ESC 中止。"
             update_overlay(overlay_msg)
             evt = self._poll()
             if evt is None:
                 continue
             kind, payload = evt
             if kind == "click":
-                points.append(payload)
+                self._append_point(payload)
                 log(f"步骤 {step_label}: 添加点 {payload}")
             elif kind == "back":
-                if points:
-                    removed = points.pop()
+                if self._pts_n:
+                    removed = self._pop_point()
                     log(f"步骤 {step_label}: 撤销点 {removed}")
                 else:
                     log(f"步骤 {step_label}: 无可撤销点，返回重做本步骤")
-                    return "back", []
+                    return "back", self._pts_buf[:0].copy()
             elif kind == "finish":
-                log(f"步骤 {step_label}: 结束取点，共 {len(points)} 个")
-                return "ok", points
+                log(f"步骤 {step_label}: 结束取点，共 {self._pts_n} 个")
+                return "ok", self._pts_buf[: self._pts_n].copy()
             elif kind == "cancel":
                 set_cancel_reason("用户中止")
                 log("用户通过键盘中止")
@@ -168,6 +289,27 @@ def set_stage(stage):
     log(f"stage={stage}")
 
 
+def capture_background(fig):
+    # 缓存不含覆盖层文字的整幅渲染结果；曲线确认后需重新缓存
+    global OVERLAY_BG
+    fig.canvas.draw()
+    OVERLAY_BG = fig.canvas.copy_from_bbox(fig.bbox)
+
+
+def _on_canvas_draw(event):
+    # 任何完整重绘（工具栏缩放/平移、窗口缩放、draw_idle）都会让旧缓存失效；
+    # 在 draw_event 里重新截取，blit 才不会把缩放前的画面盖回去
+    global OVERLAY_BG
+    fig = event.canvas.figure
+    OVERLAY_BG = event.canvas.copy_from_bbox(fig.bbox)
+    if OVERLAY_TEXT is not None:
+        fig.draw_artist(OVERLAY_TEXT)
+
+
+def attach_blit_cache(fig):
+    fig.canvas.mpl_connect("draw_event", _on_canvas_draw)
+
+
 def set_overlay(fig, text):
     global OVERLAY_TEXT
     if OVERLAY_TEXT is None:
@@ -179,11 +321,36 @@ def set_overlay(fig, text):
             va="top",
             fontsize=11,
             color="white",
-            bbox={"facecolor": "black", "alpha": 0.6, "pad": 6},
+            animated=True,
+            # 固定 boxstyle 的背景框，刷新时不再按字体度量重算内边距
+            bbox={"boxstyle": "square,pad=0.3", "facecolor": "black", "alpha": 0.6},
         )
     else:
         OVERLAY_TEXT.set_text(text)
-    fig.canvas.draw_idle()
+    if OVERLAY_BG is None:
+        fig.canvas.draw_idle()
+        return
+    # 只重绘文字区域，避免每次按键/点击都重栅格化整幅底图
+    fig.canvas.restore_region(OVERLAY_BG)
+    fig.draw_artist(OVERLAY_TEXT)
+    fig.canvas.blit(fig.bbox)
+
+
+def draw_curve(fig, ax, px, py, style):
+    # 新曲线以 blit 方式叠绘到缓存底图上并并入缓存，
+    # 后面的 IGV 不用为之前的曲线重付整幅重栅格化的代价
+    global OVERLAY_BG
+    line, = ax.plot(px, py, style, linewidth=1.5, animated=True)
+    if OVERLAY_BG is None:
+        capture_background(fig)
+    fig.canvas.restore_region(OVERLAY_BG)
+    ax.draw_artist(line)
+    fig.canvas.blit(fig.bbox)
+    OVERLAY_BG = fig.canvas.copy_from_bbox(fig.bbox)
+    # 并入缓存后恢复普通状态，完整重绘（缩放/最终 show）仍包含该曲线
+    line.set_animated(False)
+    fig.canvas.flush_events()
+    return line
 
 
 def announce_step(fig, step, message):
@@ -196,6 +363,7 @@ def ginput_single(manager, fig, ax, stage, step_label, overlay_text):
     set_cancel_reason(None)
     set_stage(stage)
     ax.set_title(overlay_text)
+    fig.canvas.draw_idle()
     announce_step(fig, step_label, overlay_text)
     while True:
         status, payload = manager.wait_single()
@@ -211,19 +379,16 @@ def ginput_many(manager, fig, ax, stage, step_label, overlay_text):
     set_cancel_reason(None)
     set_stage(stage)
     ax.set_title(overlay_text)
+    fig.canvas.draw_idle()
     announce_step(fig, step_label, overlay_text)
 
     def updater(msg):
         set_overlay(fig, f"步骤 {step_label}:\n{msg}")
 
     status, pts = manager.wait_many(overlay_text, step_label, updater)
-    if status == "back":
-        return "back", (np.array([]), np.array([]))
-    pts = np.array(pts)
-    if pts.size == 0:
-        return "ok", (np.array([]), np.array([]))
-    x, y = zip(*pts)
-    return "ok", (np.array(x), np.array(y))
+    if status == "back" or pts.size == 0:
+        return status, (np.array([]), np.array([]))
+    return "ok", (pts[:, 0], pts[:, 1])
 
 
 def attach_close_logger(fig):
@@ -238,21 +403,36 @@ def attach_close_logger(fig):
 
 
 def select_image():
-    root = Tk()
-    root.withdraw()
-    root.update()
     path = filedialog.askopenfilename(
-        filetypes=[("Image Files", "*.png *.jpg *.jpeg *.bmp *.tif *.tiff")]
+        parent=get_tk_root(),
+        filetypes=[("Image Files", "*.png *.jpg *.jpeg *.bmp *.tif *.tiff")],
     )
-    root.destroy()
     return path
 
 
-def pixel_to_value(pixel, p1, p2, v1, v2):
+def axis_affine(p1, p2, v1, v2):
+    # 标定后一次性计算 像素->数值 的仿射系数；退化情况（两点重合）退化为常数 v1
     if p1 == p2:
-        return np.full_like(pixel, v1, dtype=float) if isinstance(pixel, np.ndarray) else float(v1)
+        return 0.0, float(v1)
     scale = (v2 - v1) / (p2 - p1)
-    return (pixel - p1) * scale + v1
+    return scale, float(v1) - p1 * scale
+
+
+def _affine_transform(px, py, scale, offset):
+    n = px.shape[0]
+    xs = np.empty(n)
+    ys = np.empty(n)
+    for i in range(n):
+        xs[i] = px[i] * scale[0] + offset[0]
+        ys[i] = py[i] * scale[1] + offset[1]
+    return xs, ys
+
+
+def pixels_to_values(px, py, scale, offset):
+    # 一次变换同时处理 x/y 两个坐标，避免逐轴多次分配
+    if _affine_nb is not None:
+        return _affine_nb(np.ascontiguousarray(px), np.ascontiguousarray(py), scale, offset)
+    return (np.column_stack([px, py]) * scale + offset).T
 
 
 def get_color(idx):
@@ -273,17 +453,12 @@ def prompt_float(prompt_text, title, default=None):
 
         if raw is None or raw == "":
             # No stdin (double-click) or empty: use dialog
-            root = Tk()
-            root.withdraw()
-            try:
-                ans = simpledialog.askstring(
-                    title=title,
-                    prompt=prompt_text,
-                    initialvalue=str(default) if default is not None else None,
-                    parent=root,
-                )
-            finally:
-                root.destroy()
+            ans = simpledialog.askstring(
+                title=title,
+                prompt=prompt_text,
+                initialvalue=str(default) if default is not None else None,
+                parent=get_tk_root(),
+            )
             if ans is None:
                 set_cancel_reason("用户取消输入")
                 log("用户取消数值输入对话框")
@@ -317,17 +492,13 @@ def click_many(fig, ax, title_text, stage, step_label, hint, close_state):
 
 
 def choose_save_path(default_name="Compressor_Curve_Data.csv"):
-    root = Tk()
-    root.withdraw()
-    try:
-        path = filedialog.asksaveasfilename(
-            title="选择导出 CSV 路径",
-            defaultextension=".csv",
-            initialfile=default_name,
-            filetypes=[("CSV 文件", "*.csv"), ("所有文件", "*.*")],
-        )
-    finally:
-        root.destroy()
+    path = filedialog.asksaveasfilename(
+        parent=get_tk_root(),
+        title="选择导出 CSV 路径",
+        defaultextension=".csv",
+        initialfile=default_name,
+        filetypes=[("CSV 文件", "*.csv"), ("所有文件", "*.*")],
+    )
     return path
 
 
@@ -375,9 +546,10 @@ def parse_float_value(text, default_val, name):
 
 
 def show_welcome_dialog(default_igvs, default_num_points, default_design_flow):
-    root = Tk()
-    root.title("压缩机曲线提取器")
-    root.resizable(False, False)
+    root = get_tk_root()
+    win = tk.Toplevel(root)
+    win.title("压缩机曲线提取器")
+    win.resizable(False, False)
 
     info = (
         "欢迎使用压缩机曲线提取器。\n"
@@ -386,22 +558,26 @@ def show_welcome_dialog(default_igvs, default_num_points, default_design_flow):
         "快捷键：B 后退一步，Q/ESC 中止。"
     )
 
-    label = tk.Label(root, text=info, justify="left", padx=10, pady=8)
-    label.grid(row=0, column=0, columnspan=2, sticky="w")
+    # ttk 原生控件创建更轻，统一放进一个 Frame，布局只计算一次
+    frame = ttk.Frame(win, padding=(10, 8))
+    frame.grid(row=0, column=0)
+
+    label = ttk.Label(frame, text=info, justify="left")
+    label.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 4))
 
-    tk.Label(root, text="IGV 列表（逗号分隔）:").grid(row=1, column=0, sticky="e", padx=6, pady=4)
-    tk.Label(root, text="采样点数量 (num_points):").grid(row=2, column=0, sticky="e", padx=6, pady=4)
-    tk.Label(root, text="设计流量 (design_flow):").grid(row=3, column=0, sticky="e", padx=6, pady=4)
+    ttk.Label(frame, text="IGV 列表（逗号分隔）:").grid(row=1, column=0, sticky="e", padx=6, pady=4)
+    ttk.Label(frame, text="采样点数量 (num_points):").grid(row=2, column=0, sticky="e", padx=6, pady=4)
+    ttk.Label(frame, text="设计流量 (design_flow):").grid(row=3, column=0, sticky="e", padx=6, pady=4)
 
-    igv_entry = tk.Entry(root, width=36)
+    igv_entry = ttk.Entry(frame, width=36)
     igv_entry.insert(0, ", ".join(str(v).rstrip("0").rstrip(".") for v in default_igvs))
     igv_entry.grid(row=1, column=1, padx=6, pady=4)
 
-    num_entry = tk.Entry(root, width=36)
+    num_entry = ttk.Entry(frame, width=36)
     num_entry.insert(0, str(default_num_points))
     num_entry.grid(row=2, column=1, padx=6, pady=4)
 
-    flow_entry = tk.Entry(root, width=36)
+    flow_entry = ttk.Entry(frame, width=36)
     flow_entry.insert(0, str(default_design_flow))
     flow_entry.grid(row=3, column=1, padx=6, pady=4)
 
@@ -413,33 +589,35 @@ def show_welcome_dialog(default_igvs, default_num_points, default_design_flow):
         design_flow, df_msg = parse_float_value(flow_entry.get(), default_design_flow, "设计流量")
         msgs = [m for m in (igv_msg, np_msg, df_msg) if m]
         if msgs:
-            messagebox.showinfo("提示", "\n".join(msgs), parent=root)
+            messagebox.showinfo("提示", "\n".join(msgs), parent=win)
         result.update({
             "cancel": False,
             "igvs": igvs,
             "num_points": num_points,
             "design_flow": design_flow,
         })
-        root.destroy()
+        win.destroy()
 
     def on_cancel():
         result["cancel"] = True
-        root.destroy()
+        win.destroy()
 
-    btn_start = tk.Button(root, text="开始", width=10, command=on_start)
-    btn_cancel = tk.Button(root, text="退出/取消", width=10, command=on_cancel)
+    btn_start = ttk.Button(frame, text="开始", width=10, command=on_start)
+    btn_cancel = ttk.Button(frame, text="退出/取消", width=10, command=on_cancel)
     btn_start.grid(row=4, column=0, padx=6, pady=10)
     btn_cancel.grid(row=4, column=1, padx=6, pady=10, sticky="e")
 
-    root.protocol("WM_DELETE_WINDOW", on_cancel)
-    root.mainloop()
+    # 不做 grab：唯一的其他窗口是隐藏的根窗口，而且窗口尚未映射时 grab 会抛 TclError
+    win.protocol("WM_DELETE_WINDOW", on_cancel)
+    win.update_idletasks()
+    root.wait_window(win)
 
     if result.get("cancel"):
         return None
     return result["igvs"], result["num_points"], result["design_flow"]
 
 
-def safe_pchip(x, y, x_new):
+def _prepare_series(x, y):
     # 去重 + 排序，避免插值报错
     x = np.asarray(x, dtype=float)
     y = np.asarray(y, dtype=float)
@@ -448,18 +626,101 @@ def safe_pchip(x, y, x_new):
     x = x[order]
     y = y[order]
 
-    x_unique, idx = np.unique(x, return_index=True)
-    y_unique = y[idx]
+    # 已排序，去重只需比较相邻元素，省掉 np.unique 的内部二次排序
+    mask = np.empty(len(x), dtype=bool)
+    mask[:1] = True
+    np.not_equal(x[1:], x[:-1], out=mask[1:])
+    x_unique = x[mask]
+    y_unique = y[mask]
 
     if len(x_unique) < 2:
         raise ValueError("点太少，无法插值（至少需要2个不同的x点）")
+    return x_unique, y_unique
 
-    return PchipInterpolator(x_unique, y_unique)(x_new)
+
+def _pchip_eval(x, y, x_new):
+    # Fritsch-Carlson 保形导数 + Hermite 求值，结果与 scipy 的 PchipInterpolator 一致
+    n = x.shape[0]
+    d = np.empty(n)
+    if n == 2:
+        slope = (y[1] - y[0]) / (x[1] - x[0])
+        d[0] = slope
+        d[1] = slope
+    else:
+        h = np.empty(n - 1)
+        delta = np.empty(n - 1)
+        for i in range(n - 1):
+            h[i] = x[i + 1] - x[i]
+            delta[i] = (y[i + 1] - y[i]) / h[i]
+        for i in range(1, n - 1):
+            if delta[i - 1] * delta[i] <= 0.0:
+                d[i] = 0.0
+            else:
+                w1 = 2.0 * h[i] + h[i - 1]
+                w2 = h[i] + 2.0 * h[i - 1]
+                d[i] = (w1 + w2) / (w1 / delta[i - 1] + w2 / delta[i])
+        dk = ((2.0 * h[0] + h[1]) * delta[0] - h[0] * delta[1]) / (h[0] + h[1])
+        if dk * delta[0] <= 0.0:
+            dk = 0.0
+        elif delta[0] * delta[1] < 0.0 and abs(dk) > 3.0 * abs(delta[0]):
+            dk = 3.0 * delta[0]
+        d[0] = dk
+        dk = ((2.0 * h[n - 2] + h[n - 3]) * delta[n - 2] - h[n - 2] * delta[n - 3]) / (
+            h[n - 2] + h[n - 3]
+        )
+        if dk * delta[n - 2] <= 0.0:
+            dk = 0.0
+        elif delta[n - 2] * delta[n - 3] < 0.0 and abs(dk) > 3.0 * abs(delta[n - 2]):
+            dk = 3.0 * delta[n - 2]
+        d[n - 1] = dk
+
+    out = np.empty(x_new.shape[0])
+    for j in range(x_new.shape[0]):
+        xv = x_new[j]
+        # 点数少，线性扫描定位区间即可
+        i = n - 2
+        for k in range(n - 1):
+            if xv <= x[k + 1]:
+                i = k
+                break
+        hi = x[i + 1] - x[i]
+        t = (xv - x[i]) / hi
+        t2 = t * t
+        t3 = t2 * t
+        out[j] = (
+            (2.0 * t3 - 3.0 * t2 + 1.0) * y[i]
+            + (t3 - 2.0 * t2 + t) * hi * d[i]
+            + (-2.0 * t3 + 3.0 * t2) * y[i + 1]
+            + (t3 - t2) * hi * d[i + 1]
+        )
+    return out
+
+
+def _interp_series(x_u, y_u, x_new):
+    # 单调数据走纯 C 的 np.interp；PCHIP 的保形性只在非单调（可能过冲）时才需要
+    dy = np.diff(y_u)
+    if np.all(dy >= 0) or np.all(dy <= 0):
+        return np.interp(x_new, x_u, y_u)
+    if _pchip_eval_nb is not None:
+        return _pchip_eval_nb(x_u, y_u, np.asarray(x_new, dtype=float))
+    return PchipInterpolator(x_u, y_u)(x_new)
+
+
+def safe_pchip(x, y, x_new):
+    x_u, y_u = _prepare_series(x, y)
+    return _interp_series(x_u, y_u, x_new)
+
+
+def safe_pchip_batch(x_list, y_list, x_new):
+    # 同一采样网格 x_new 上一次性插值多条曲线（每个 IGV 的压力与功率成对出现）
+    return [
+        _interp_series(*_prepare_series(x, y), x_new)
+        for x, y in zip(x_list, y_list)
+    ]
 
 
 def main():
     log(f"Python 路径: {sys.executable}")
-    log(f"Matplotlib 后端: {mpl.get_backend()} ({_BACKEND_SOURCE})")
     log(f"Conda 环境: {os.environ.get('CONDA_DEFAULT_ENV', 'unknown')}")
     log(f"日志文件: {LOG_PATH}")
 
@@ -467,6 +728,8 @@ def main():
     if config is None:
         log("用户取消启动")
         return
+    init_heavy_imports()
+    log(f"Matplotlib 后端: {mpl.get_backend()} ({_BACKEND_SOURCE})")
     target_igvs, num_points, design_flow = config
     log(f"IGV 列表: {target_igvs}")
     log(f"采样点数量: {num_points}，设计流量: {design_flow}")
@@ -486,8 +749,18 @@ def main():
         print(f"打开图片失败：{e}")
         return
 
-    fig, ax = plt.subplots(figsize=(12, 8))
+    # 多百万像素扫描图按显示尺寸降采样（2 倍留缩放余量），减少每次重绘的像素带宽。
+    # 标定与取点都在降采样后的坐标系里进行，像素->数值的仿射映射自洽，无需换算。
+    dpi = mpl.rcParams["figure.dpi"]
+    target = (int(FIGSIZE[0] * dpi * 2), int(FIGSIZE[1] * dpi * 2))
+    if img.width > target[0] or img.height > target[1]:
+        orig_size = img.size
+        img.thumbnail(target, Image.LANCZOS)
+        log(f"图片已降采样: {orig_size} -> {img.size}")
+
+    fig, ax = plt.subplots(figsize=FIGSIZE)
     close_state = attach_close_logger(fig)
+    attach_blit_cache(fig)
     global INTERACTION
     INTERACTION = InteractionManager(fig, ax, close_state)
     ax.imshow(img)
@@ -496,7 +769,9 @@ def main():
     # Windows上更稳：让窗口真正进入事件循环
     log("show(block=False) before")
     plt.show(block=False)
-    plt.pause(0.1)
+    # flush_events 一次性处理积压的后端事件，不再强制睡眠 100 ms
+    fig.canvas.flush_events()
+    capture_background(fig)
     log("show(block=False) after")
 
     log("===== 标定坐标轴（上图：压力-流量；下图：功率-流量）=====")
@@ -507,16 +782,16 @@ def main():
         while idx < len(steps):
             s = steps[idx]
             hint = (
-                f"{s['overlay']}\n"
+                f"{s.overlay}\n"
                 "只需点击 1 次坐标轴刻度线对应数值的交点（不是曲线点）。"
                 "\n左键=确认，B=后退一步，Q/ESC=中止。"
             )
             status, pt = click_one(
                 fig,
                 ax,
-                s["overlay"],
-                s["stage"],
-                s["step"],
+                s.overlay,
+                s.stage,
+                s.step,
                 hint,
                 close_state,
             )
@@ -528,130 +803,128 @@ def main():
                     log("当前已是第一步，无法后退。")
                 continue
 
-            coord_val = pt[0] if s["coord"] == "x" else pt[1]
-            values[s["pix_key"]] = coord_val
-            num_val = prompt_float(s["prompt"], s["prompt_title"], default=s["default"])
-            values[s["val_key"]] = num_val
-            log(f"{s['stage']} 完成; 像素={coord_val}, 数值={num_val}")
+            coord_val = pt[0] if s.coord == "x" else pt[1]
+            values[s.pix_key] = coord_val
+            num_val = prompt_float(s.prompt, s.prompt_title, default=s.default)
+            values[s.val_key] = num_val
+            log(f"{s.stage} 完成; 像素={coord_val}, 数值={num_val}")
             idx += 1
         return values
 
     top_steps = [
-        {
-            "stage": "calibrate_top_x1",
-            "step": "2",
-            "overlay": "上图（压力-流量）X轴起点：点击左端刻度线与轴交点（最小流量）。",
-            "prompt": "上图 X轴 起始数值（例如最小流量 3000）:",
-            "prompt_title": "上图 X轴 起始数值",
-            "default": 3000,
-            "coord": "x",
-            "pix_key": "x1",
-            "val_key": "v_x1",
-        },
-        {
-            "stage": "calibrate_top_x2",
-            "step": "3",
-            "overlay": "上图（压力-流量）X轴终点：点击右端刻度线与轴交点（最大流量）。",
-            "prompt": "上图 X轴 结束数值（例如最大流量 6000）:",
-            "prompt_title": "上图 X轴 结束数值",
-            "default": 6000,
-            "coord": "x",
-            "pix_key": "x2",
-            "val_key": "v_x2",
-        },
-        {
-            "stage": "calibrate_top_y1",
-            "step": "4",
-            "overlay": "上图（压力-流量）Y轴起点：点击下端刻度线与轴交点（最小压力）。",
-            "prompt": "上图 Y轴 起始数值（例如最小压力 2）:",
-            "prompt_title": "上图 Y轴 起始数值",
-            "default": 2,
-            "coord": "y",
-            "pix_key": "y1",
-            "val_key": "v_y1",
-        },
-        {
-            "stage": "calibrate_top_y2",
-            "step": "5",
-            "overlay": "上图（压力-流量）Y轴终点：点击上端刻度线与轴交点（最大压力）。",
-            "prompt": "上图 Y轴 结束数值（例如最大压力 11）:",
-            "prompt_title": "上图 Y轴 结束数值",
-            "default": 11,
-            "coord": "y",
-            "pix_key": "y2",
-            "val_key": "v_y2",
-        },
+        CalibStep(
+            stage="calibrate_top_x1",
+            step="2",
+            overlay="上图（压力-流量）X轴起点：点击左端刻度线与轴交点（最小流量）。",
+            prompt="上图 X轴 起始数值（例如最小流量 3000）:",
+            prompt_title="上图 X轴 起始数值",
+            default=3000,
+            coord="x",
+            pix_key="x1",
+            val_key="v_x1",
+        ),
+        CalibStep(
+            stage="calibrate_top_x2",
+            step="3",
+            overlay="上图（压力-流量）X轴终点：点击右端刻度线与轴交点（最大流量）。",
+            prompt="上图 X轴 结束数值（例如最大流量 6000）:",
+            prompt_title="上图 X轴 结束数值",
+            default=6000,
+            coord="x",
+            pix_key="x2",
+            val_key="v_x2",
+        ),
+        CalibStep(
+            stage="calibrate_top_y1",
+            step="4",
+            overlay="上图（压力-流量）Y轴起点：点击下端刻度线与轴交点（最小压力）。",
+            prompt="上图 Y轴 起始数值（例如最小压力 2）:",
+            prompt_title="上图 Y轴 起始数值",
+            default=2,
+            coord="y",
+            pix_key="y1",
+            val_key="v_y1",
+        ),
+        CalibStep(
+            stage="calibrate_top_y2",
+            step="5",
+            overlay="上图（压力-流量）Y轴终点：点击上端刻度线与轴交点（最大压力）。",
+            prompt="上图 Y轴 结束数值（例如最大压力 11）:",
+            prompt_title="上图 Y轴 结束数值",
+            default=11,
+            coord="y",
+            pix_key="y2",
+            val_key="v_y2",
+        ),
     ]
 
     bot_steps = [
-        {
-            "stage": "calibrate_bottom_x1",
-            "step": "6",
-            "overlay": "下图（功率-流量）X轴起点：点击左端刻度线与轴交点（最小流量）。",
-            "prompt": "下图 X轴 起始数值（例如最小流量 3000）:",
-            "prompt_title": "下图 X轴 起始数值",
-            "default": 3000,
-            "coord": "x",
-            "pix_key": "bx1",
-            "val_key": "bv_x1",
-        },
-        {
-            "stage": "calibrate_bottom_x2",
-            "step": "7",
-            "overlay": "下图（功率-流量）X轴终点：点击右端刻度线与轴交点（最大流量）。",
-            "prompt": "下图 X轴 结束数值（例如最大流量 6000）:",
-            "prompt_title": "下图 X轴 结束数值",
-            "default": 6000,
-            "coord": "x",
-            "pix_key": "bx2",
-            "val_key": "bv_x2",
-        },
-        {
-            "stage": "calibrate_bottom_y1",
-            "step": "8",
-            "overlay": "下图（功率-流量）Y轴起点：点击下端刻度线与轴交点（最小功率）。",
-            "prompt": "下图 Y轴 起始数值（例如最小功率 250）:",
-            "prompt_title": "下图 Y轴 起始数值",
-            "default": 250,
-            "coord": "y",
-            "pix_key": "by1",
-            "val_key": "bv_y1",
-        },
-        {
-            "stage": "calibrate_bottom_y2",
-            "step": "9",
-            "overlay": "下图（功率-流量）Y轴终点：点击上端刻度线与轴交点（最大功率）。",
-            "prompt": "下图 Y轴 结束数值（例如最大功率 550）:",
-            "prompt_title": "下图 Y轴 结束数值",
-            "default": 550,
-            "coord": "y",
-            "pix_key": "by2",
-            "val_key": "bv_y2",
-        },
+        CalibStep(
+            stage="calibrate_bottom_x1",
+            step="6",
+            overlay="下图（功率-流量）X轴起点：点击左端刻度线与轴交点（最小流量）。",
+            prompt="下图 X轴 起始数值（例如最小流量 3000）:",
+            prompt_title="下图 X轴 起始数值",
+            default=3000,
+            coord="x",
+            pix_key="bx1",
+            val_key="bv_x1",
+        ),
+        CalibStep(
+            stage="calibrate_bottom_x2",
+            step="7",
+            overlay="下图（功率-流量）X轴终点：点击右端刻度线与轴交点（最大流量）。",
+            prompt="下图 X轴 结束数值（例如最大流量 6000）:",
+            prompt_title="下图 X轴 结束数值",
+            default=6000,
+            coord="x",
+            pix_key="bx2",
+            val_key="bv_x2",
+        ),
+        CalibStep(
+            stage="calibrate_bottom_y1",
+            step="8",
+            overlay="下图（功率-流量）Y轴起点：点击下端刻度线与轴交点（最小功率）。",
+            prompt="下图 Y轴 起始数值（例如最小功率 250）:",
+            prompt_title="下图 Y轴 起始数值",
+            default=250,
+            coord="y",
+            pix_key="by1",
+            val_key="bv_y1",
+        ),
+        CalibStep(
+            stage="calibrate_bottom_y2",
+            step="9",
+            overlay="下图（功率-流量）Y轴终点：点击上端刻度线与轴交点（最大功率）。",
+            prompt="下图 Y轴 结束数值（例如最大功率 550）:",
+            prompt_title="下图 Y轴 结束数值",
+            default=550,
+            coord="y",
+            pix_key="by2",
+            val_key="bv_y2",
+        ),
     ]
 
     top_vals = run_calibration(top_steps)
     bot_vals = run_calibration(bot_steps)
 
-    x1 = top_vals["x1"]
-    x2 = top_vals["x2"]
-    v_x1 = top_vals["v_x1"]
-    v_x2 = top_vals["v_x2"]
-    y1 = top_vals["y1"]
-    y2 = top_vals["y2"]
-    v_y1 = top_vals["v_y1"]
-    v_y2 = top_vals["v_y2"]
-    top_axis = (x1, x2, v_x1, v_x2, y1, y2, v_y1, v_y2)
-
-    bx1 = bot_vals["bx1"]
-    bx2 = bot_vals["bx2"]
-    bv_x1 = bot_vals["bv_x1"]
-    bv_x2 = bot_vals["bv_x2"]
-    by1 = bot_vals["by1"]
-    by2 = bot_vals["by2"]
-    bv_y1 = bot_vals["bv_y1"]
-    bv_y2 = bot_vals["bv_y2"]
-    bot_axis = (bx1, bx2, bv_x1, bv_x2, by1, by2, bv_y1, bv_y2)
+    top_sx, top_ox = axis_affine(
+        top_vals["x1"], top_vals["x2"], top_vals["v_x1"], top_vals["v_x2"]
+    )
+    top_sy, top_oy = axis_affine(
+        top_vals["y1"], top_vals["y2"], top_vals["v_y1"], top_vals["v_y2"]
+    )
+    top_scale = np.array([top_sx, top_sy])
+    top_offset = np.array([top_ox, top_oy])
+
+    bot_sx, bot_ox = axis_affine(
+        bot_vals["bx1"], bot_vals["bx2"], bot_vals["bv_x1"], bot_vals["bv_x2"]
+    )
+    bot_sy, bot_oy = axis_affine(
+        bot_vals["by1"], bot_vals["by2"], bot_vals["bv_y1"], bot_vals["bv_y2"]
+    )
+    bot_scale = np.array([bot_sx, bot_sy])
+    bot_offset = np.array([bot_ox, bot_oy])
 
     final_rows = []
 
@@ -681,9 +954,8 @@ def main():
                 log(f"IGV={igv} 上图未取点，跳过")
                 break
 
-            q_p = pixel_to_value(px, *top_axis[:4])
-            p_val = pixel_to_value(py, *top_axis[4:])
-            ax.plot(px, py, color + "o-", linewidth=1.5)
+            q_p, p_val = pixels_to_values(px, py, top_scale, top_offset)
+            draw_curve(fig, ax, px, py, color + "o-")
 
             skip_igv = False
             while True:
@@ -704,9 +976,8 @@ def main():
                     skip_igv = True
                     break
 
-                q_k = pixel_to_value(kx, *bot_axis[:4])
-                kw_val = pixel_to_value(ky, *bot_axis[4:])
-                ax.plot(kx, ky, color + "s-", linewidth=1.5)
+                q_k, kw_val = pixels_to_values(kx, ky, bot_scale, bot_offset)
+                draw_curve(fig, ax, kx, ky, color + "s-")
                 break
 
             if skip_igv:
@@ -722,8 +993,7 @@ def main():
             q_std = np.linspace(q_max, q_min, num_points)
 
             try:
-                p_interp = safe_pchip(q_p, p_val, q_std)
-                kw_interp = safe_pchip(q_k, kw_val, q_std)
+                p_interp, kw_interp = safe_pchip_batch([q_p, q_k], [p_val, kw_val], q_std)
             except Exception as e:
                 log(f"IGV={igv} 插值失败：{e}")
                 break
@@ -735,11 +1005,15 @@ def main():
                     q_std[idx] = design_flow
                     comments[idx] = "design_point"
 
-            for q, p, kw, cmt in zip(q_std, p_interp, kw_interp, comments):
-                final_rows.append([igv, int(round(q)), round(float(p), 2), round(float(kw), 1), cmt])
+            # 取整/舍入整列一次完成，再拼成输出行，避免逐标量调用 round
+            q_int = np.rint(q_std).astype(int).tolist()
+            p_round = np.round(p_interp, 2).tolist()
+            kw_round = np.round(kw_interp, 1).tolist()
+            final_rows.extend(
+                [igv, q, p, kw, cmt]
+                for q, p, kw, cmt in zip(q_int, p_round, kw_round, comments)
+            )
 
-            plt.draw()
-            plt.pause(0.01)
             break
 
     final_step = 10 + len(target_igvs) * 2
@@ -756,9 +1030,11 @@ def main():
         log("退出：用户取消保存")
         return
 
-    df = pd.DataFrame(final_rows, columns=["IGV_deg", "Q_Nm3hr", "Pdis_bar_g", "Power_kW", "comment"])
-    df.to_csv(save_path, index=False, encoding="utf-8-sig")
-    log(f"CSV 已导出到 {save_path}；共 {len(df)} 行")
+    with open(save_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(["IGV_deg", "Q_Nm3hr", "Pdis_bar_g", "Power_kW", "comment"])
+        writer.writerows(final_rows)
+    log(f"CSV 已导出到 {save_path}；共 {len(final_rows)} 行")
 
     ax.set_title(f"完成：已导出 {save_path}")
     done_step = str(final_step + 1)
@@ -780,3 +1056,5 @@ if __name__ == "__main__":
         log("退出：未处理异常，正在打印 traceback")
         log_traceback()
         traceback.print_exc()
+    finally:
+        destroy_tk_root()